@@ -3,6 +3,12 @@ import os
 import yaml
 from pathlib import Path
 
+# use the LibYAML-based C implementation when available
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 def main():
     config_path = Path(__file__).parent.parent.parent / "notebooks"/ "_config.yml"
 
@@ -18,12 +24,12 @@ def main():
     repo_url = f"{github_server_url}/{github_repo}"
 
     with config_path.open("r") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
 
     config.setdefault("repository", {})["url"] = repo_url
 
     with config_path.open("w") as f:
-        yaml.dump(config, f, sort_keys=False)
+        yaml.dump(config, f, Dumper=SafeDumper, sort_keys=False)
 
     print(f"✅ Injected repository.url: {repo_url}")
 
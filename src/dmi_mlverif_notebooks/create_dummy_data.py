@@ -1,9 +1,13 @@
 import argparse
 import random
+import dask.array
 import numpy as np
 import xarray as xr
 import fsspec
 
+# chunk sizes used when writing the perturbed dataset
+ZARR_WRITE_CHUNKS = {'time': -1, 'x': 512, 'y': 512}
+
 def apply_perturbations(ds, trends, error_magnitudes):
     """
     Apply random error and trends to the dataset.
@@ -19,28 +23,55 @@ def apply_perturbations(ds, trends, error_magnitudes):
     Returns:
     - perturbed_ds: xarray Dataset with applied perturbations
     """
-    perturbed_ds = ds.copy()
+    rng = np.random.default_rng()
+    var_names = [var for var in trends if var in ds.data_vars]
 
-    for var in ds.data_vars:
-        if var in trends:
-            trend = trends[var]
-            error_magnitude = error_magnitudes.get(var, 0)
+    trend_ds = xr.Dataset({var: trends[var] for var in var_names})
+    error_ds = xr.Dataset({var: error_magnitudes.get(var, 0) for var in var_names})
+    # Random error drawn from a standard normal distribution, generated lazily
+    # (and in parallel) with dask when the variable is chunked
+    noise_ds = xr.Dataset(
+        {var: (ds[var].dims, _standard_normal_like(ds[var], rng)) for var in var_names}
+    )
 
-            # Apply trend (e.g., linearly changing)
-            perturbed_ds[var] = ds[var] + trend * ds['time']
+    # Apply trend (e.g., linearly changing) and random error scaled by the error magnitude
+    perturbed = ds[var_names] + trend_ds * ds['time'] + error_ds * noise_ds
 
-            # Add random error based on a normal distribution
-            perturbed_ds[var] += np.random.normal(0, error_magnitude, size=ds[var].shape)
+    # shallow copy, variables that aren't perturbed share their data with `ds`
+    perturbed_ds = ds.copy(deep=False)
+    perturbed_ds.update(perturbed)
 
     return perturbed_ds
 
+def _standard_normal_like(da, rng):
+    """Draw standard normal samples with the same shape (and chunks) as `da`."""
+    if da.chunks is not None:
+        return dask.array.random.default_rng(rng).standard_normal(da.shape, chunks=da.chunks)
+    return rng.standard_normal(da.shape)
+
 def read_zarr_from_path(path):
     """Read a Zarr file from a path (including S3 URLs)."""
     return xr.open_zarr(path, consolidated=False)
 
 def write_zarr_to_path(ds, output_path):
-    """Write a Zarr dataset to a path (including S3 URLs)."""
-    ds.to_zarr(output_path, mode='w')
+    """
+    Write a Zarr dataset to a path (including S3 URLs).
+
+    Before writing, the dataset is rechunked along the dimensions in
+    `ZARR_WRITE_CHUNKS` (all timesteps in a single chunk and 512x512 points
+    in x/y), so that writes to object stores (e.g. S3) aren't made up of many
+    small (e.g. per-timestep) chunks. Dimensions not in `ZARR_WRITE_CHUNKS`
+    keep the chunking of the source, and the chunk size grows with the
+    number of timesteps (e.g. ~1 MB per timestep for float32 data).
+    """
+    chunks = {dim: size for dim, size in ZARR_WRITE_CHUNKS.items() if dim in ds.dims}
+    ds = ds.chunk(chunks)
+    for var in ds.variables.values():
+        # the chunking of the source is kept in the encoding and would
+        # otherwise conflict with the new chunks when writing
+        var.encoding.pop('chunks', None)
+        var.encoding.pop('preferred_chunks', None)
+    ds.to_zarr(output_path, mode='w', consolidated=True)
 
 def parse_trend_or_error(value):
     """Parse the trend or error argument (e.g., 'cape_column=0.1' -> ('cape_column', 0.1))"""
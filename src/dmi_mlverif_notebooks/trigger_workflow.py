@@ -1,6 +1,8 @@
 
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import re
 from dotenv import load_dotenv
@@ -12,6 +14,28 @@ from .constants import WORKFLOW_FILE
 # Load environment variables
 load_dotenv()
 
+# Reuse connections to the GitHub API across calls and retry on transient
+# server errors. POST is not retried by default, so allow it explicitly
+# (re-dispatching a workflow with the same inputs just rebuilds the same book)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=None,
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# matches the "owner/repo" part of GitHub remote URLs (ssh or https)
+_REMOTE_RE = re.compile(r"(?:git@github\.com:|https://github\.com/)([^/]+/[^/.]+)")
+
 def get_repo_from_git_remote(remote_name):
     try:
         repo = Repo(".")
@@ -23,7 +47,7 @@ def get_repo_from_git_remote(remote_name):
             )
         remote_url = repo.remotes[remote_name].url
 
-        match = re.match(r"(?:git@github.com:|https://github.com/)([^/]+/[^/.]+)", remote_url)
+        match = _REMOTE_RE.match(remote_url)
         if match:
             return match.group(1)
         else:
@@ -46,7 +70,7 @@ def trigger_workflow(repo, ref, analysis_time, model_name, github_token):
     }
     logger.debug(f"Triggering workflow for {repo} with ref {ref} and inputs: {payload}")
 
-    response = requests.post(url, headers=headers, json=payload)
+    response = _SESSION.post(url, headers=headers, json=payload)
     if response.status_code == 204:
         actions_url = f"https://github.com/{repo}/actions"
         logger.info(f"✅ Workflow triggered for {repo}. View status here: {actions_url}")
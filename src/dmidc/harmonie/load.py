@@ -1,8 +1,37 @@
 import isodate
 import xarray as xr
 
-def load(analysis_time, data_kind="single_levels"):
+def load(analysis_time, data_kind="single_levels", engine="zarr"):
+    """
+    Load Harmonie (DINI) model data for a given analysis time from S3.
+
+    With `engine="zarr"` (the default) the Zarr store is opened with
+    `xarray.open_zarr` using its consolidated metadata (so that all metadata
+    is read in a single request) and with the native Zarr chunking used for
+    the dask chunks. The store is therefore expected to have been written
+    with consolidated metadata (i.e. have a `.zmetadata` file, which can be
+    created with `zarr.consolidate_metadata(store)`).
+
+    With `engine="tensorstore"` the store is instead opened with
+    `xarray_tensorstore.open_zarr`, which reads chunks concurrently with
+    TensorStore and is well suited for selecting a few points from the
+    dataset (e.g. with `sel_nearest_to_latlon_pt`). This requires the
+    `xarray-tensorstore` package to be installed.
+    """
     uri_dini = f"s3://harmonie-zarr/dini/control/{isodate.datetime_isoformat(analysis_time).replace(':', '')}/{data_kind}.zarr"
     print(f"Loading model data from {uri_dini}")
-    
-    return xr.open_zarr(uri_dini)
\ No newline at end of file
+
+    if engine == "tensorstore":
+        try:
+            import xarray_tensorstore
+        except ImportError:
+            raise ImportError(
+                "Please install xarray-tensorstore to use the tensorstore engine."
+            )
+        return xarray_tensorstore.open_zarr(uri_dini)
+    elif engine != "zarr":
+        raise ValueError(f"Unknown engine: {engine}")
+
+    return xr.open_zarr(
+        uri_dini, consolidated=True, chunks={}, storage_options={"anon": False}
+    )
\ No newline at end of file
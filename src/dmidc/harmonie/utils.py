@@ -1,6 +1,10 @@
-import pickle
+import json
+import math
+import os
+import tempfile
 from pathlib import Path
 
+import numpy as np
 import scipy.spatial
 from loguru import logger
 
@@ -8,25 +12,76 @@ FP_LOOKUP_INFO_ROOT = Path(__file__).parent / "grid_lookup_trees"
 LOOKUP_INFO = {}
 
 
-def cache_to_pickle(identifier):
+def _build_kdtree(points):
+    # the tree is only built once per process (the points are cached to disk),
+    # so skip the balancing and compaction that make building slow
+    return scipy.spatial.cKDTree(points, balanced_tree=False, compact_nodes=False)
+
+
+def _write_atomic(fp, write):
+    """
+    Write to `fp` by calling `write` with a temporary file (opened in binary
+    mode) which is then moved into place, so that `fp` is never left
+    partially written.
     """
-    This function can be used as a decorator to cache the return value of a
-    function to a pickle file. The function must return a pickleable object.
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=fp.parent, suffix=".tmp", delete=False
+    ) as f:
+        fp_tmp = f.name
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.remove(fp_tmp)
+            raise
+    os.replace(fp_tmp, fp)
+
+
+def cache_lookup_tree(identifier):
+    """
+    This function can be used as a decorator to cache the nearest-point lookup
+    info returned by a function, i.e. a dict with keys "tree" (a
+    `scipy.spatial.cKDTree`), "latlon_bounds" and "lon_shape". Rather than
+    pickling the tree itself, the points of the tree are stored with
+    `numpy.save` and the remaining info as json, and the tree is rebuilt from
+    the points when loading (which is faster than unpickling the tree).
     """
 
     def decorator(func):
-        fp_pickle = FP_LOOKUP_INFO_ROOT / f"{identifier}.pkl"
+        fp_points = FP_LOOKUP_INFO_ROOT / f"{identifier}.points.npy"
+        fp_info = FP_LOOKUP_INFO_ROOT / f"{identifier}.info.json"
 
         def wrapper(*args, **kwargs):
-            if fp_pickle.exists():
-                with open(fp_pickle, "rb") as f:
-                    return pickle.load(f)
-            else:
-                result = func(*args, **kwargs)
-                fp_pickle.parent.mkdir(parents=True, exist_ok=True)
-                with open(fp_pickle, "wb") as f:
-                    pickle.dump(result, f)
-                return result
+            if fp_points.exists() and fp_info.exists():
+                try:
+                    points = np.load(fp_points, mmap_mode="r")
+                    with open(fp_info) as f:
+                        info = json.load(f)
+                    return dict(
+                        tree=_build_kdtree(points),
+                        latlon_bounds={
+                            k: tuple(v) for k, v in info["latlon_bounds"].items()
+                        },
+                        lon_shape=tuple(info["lon_shape"]),
+                    )
+                except (OSError, ValueError, KeyError):
+                    logger.warning(
+                        f"Failed to read cached lookup tree for {identifier}, "
+                        "rebuilding it"
+                    )
+
+            result = func(*args, **kwargs)
+            fp_points.parent.mkdir(parents=True, exist_ok=True)
+            info = dict(
+                latlon_bounds={
+                    k: [float(v) for v in bounds]
+                    for k, bounds in result["latlon_bounds"].items()
+                },
+                lon_shape=[int(n) for n in result["lon_shape"]],
+            )
+            _write_atomic(fp_points, lambda f: np.save(f, result["tree"].data))
+            _write_atomic(fp_info, lambda f: f.write(json.dumps(info).encode()))
+            return result
 
         return wrapper
 
@@ -44,24 +99,17 @@ def _wrap_lon(lon, lon_bounds):
     lon_bounds : tuple
         Tuple of (min, max) longitude values
     """
-    applied_rotation = 0.0
-    exception_text = (
-        f"The provided longitude value ({lon}) cannot be placed within the "
-        f"bounds ({lon_bounds}), even after applying a 360deg wrapping."
-    )
-    while lon < lon_bounds[0] or lon > lon_bounds[1]:
-        if lon < lon_bounds[0]:
-            if applied_rotation < 0:
-                raise ValueError(exception_text)
-            lon += 360
-            applied_rotation += 360
-        elif lon > lon_bounds[1]:
-            lon -= 360
-            if applied_rotation > 0:
-                raise ValueError(exception_text)
-            applied_rotation -= 360
-
-    return lon, applied_rotation
+    # shift by the whole number of 360deg rotations that puts the longitude
+    # at or above the lower bound
+    applied_rotation = -360.0 * math.floor((lon - lon_bounds[0]) / 360.0)
+    lon_wrapped = lon + applied_rotation
+    if lon_wrapped > lon_bounds[1]:
+        raise ValueError(
+            f"The provided longitude value ({lon}) cannot be placed within the "
+            f"bounds ({lon_bounds}), even after applying a 360deg wrapping."
+        )
+
+    return lon_wrapped, applied_rotation
 
 
 def sel_nearest_to_latlon_pt(ds, pt, wrap_lon=True):
@@ -94,16 +142,19 @@ def sel_nearest_to_latlon_pt(ds, pt, wrap_lon=True):
 
     lon, lat = pt["lon"], pt["lat"]
 
-    @cache_to_pickle(identifier)
+    @cache_lookup_tree(identifier)
     def build_tree():
         logger.info(f"Building nearest-point to lat/lon lookup tree for {identifier}")
-        values = list(zip(ds.lon.values.flatten(), ds.lat.values.flatten()))
-        tree_kdtree = scipy.spatial.cKDTree(values)
-        latlon_bounds = dict(
-            lat=(ds.lat.min().values, ds.lat.max().values),
-            lon=(ds.lon.min().values, ds.lon.max().values),
+        lon, lat = ds.lon.values, ds.lat.values
+        values = np.column_stack([lon.ravel(), lat.ravel()])
+        tree_kdtree = _build_kdtree(values)
+        lat_min, lat_max, lon_min, lon_max = np.asarray(
+            [lat.min(), lat.max(), lon.min(), lon.max()]
         )
-        return dict(tree=tree_kdtree, latlon_bounds=latlon_bounds)
+        latlon_bounds = dict(lat=(lat_min, lat_max), lon=(lon_min, lon_max))
+        # the shape is kept so that the flattened index of the nearest point
+        # can be decoded without reading the coordinates of `ds` again
+        return dict(tree=tree_kdtree, latlon_bounds=latlon_bounds, lon_shape=lon.shape)
 
     if identifier in LOOKUP_INFO:
         lookup_info = LOOKUP_INFO[identifier]
@@ -130,11 +181,12 @@ def sel_nearest_to_latlon_pt(ds, pt, wrap_lon=True):
         )
 
     _, idx_nearest = lookup_tree.query((lon_wrapped, lat))
-    nx, ny = ds.lon.shape
-    i, j = idx_nearest % ny, idx_nearest // ny
-
-    # TODO will need to change if the names of the spatial dimensions change
-    ds_point = ds.isel(x=i, y=j)
+    # the tree was built from the row-major flattened coordinates, so the
+    # index decodes into (row, column) of the 2D lon/lat coordinate arrays
+    n_cols = lookup_info["lon_shape"][1]
+    i_row, i_col = divmod(int(idx_nearest), n_cols)
+    dim_row, dim_col = ds.lon.dims
+    ds_point = ds.isel({dim_row: i_row, dim_col: i_col})
 
     if wrap_lon:
         ds_point["lon"] = ds_point["lon"] - applied_lon_offset
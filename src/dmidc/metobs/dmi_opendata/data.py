@@ -1,10 +1,9 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Union
 
-import geopandas as gpd
-import isodate
 import numpy as np
 import pandas as pd
-import xarray as xr
 from bidict import bidict
 from loguru import logger
 
@@ -18,54 +17,76 @@ DMIDC_OPENDATA_PARAM_MAP = bidict(
     parameter="parameterId",
     bbox="bbox",
 )
+# plain dict copies of the mapping (in both directions) for faster lookups
+_DMIDC_TO_OPENDATA_PARAMS = dict(DMIDC_OPENDATA_PARAM_MAP)
+_OPENDATA_TO_DMIDC_PARAMS = dict(DMIDC_OPENDATA_PARAM_MAP.inverse)
+
+# maximum number of concurrent requests made to the Open Data API from `load`
+MAX_CONCURRENT_REQUESTS = 16
+# shared by all (possibly nested, when loading multiple stations) thread pools
+# in `load` so that the limit applies to the total number of requests in flight
+_REQUEST_SEMAPHORE = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
 
 
 def convert_obs_df_to_dataset(df, multiple_stations=False):
+    import xarray as xr
+
     # xarray doesn't like timezones (https://github.com/pydata/xarray/issues/3291) so convert to UTC here
     def _remove_timezone(t):
-        return t.dt.tz_localize(None)
+        return t.dt.tz_convert(None)
 
     df["observation_time"] = _remove_timezone(df.observation_time)
     df["creation_time"] = _remove_timezone(df.creation_time)
 
-    # Pivot so we get a variable in the dataset for each parameter
+    # Construct a variable in the dataset for each parameter by scattering the
+    # values into arrays indexed by (station_id and) time. The time coordinate
+    # is named `time` (rather than `observation_time`) so that the time
+    # coordinate is the same across different data sources in dmidc
+    index = ["observation_time", "parameter"]
+    if multiple_stations:
+        index = ["station_id"] + index
+    if df.duplicated(index).any():
+        raise ValueError(
+            f"Observations contain duplicate entries for ({', '.join(index)})"
+        )
+
+    times, time_idx = np.unique(df.observation_time.values, return_inverse=True)
     if multiple_stations:
-        index = ["station_id", "observation_time"]
+        station_ids, station_idx = np.unique(df.station_id.values, return_inverse=True)
+        coords = dict(station_id=station_ids, time=times)
+        idx = (station_idx, time_idx)
     else:
-        index = ["observation_time"]
-    df_pivoted = df.pivot(index=index, columns="parameter", values="value")
+        coords = dict(time=times)
+        idx = (time_idx,)
+    dims = tuple(coords)
+    shape = tuple(len(coord) for coord in coords.values())
 
-    # Convert to xarray Dataset
-    ds = xr.Dataset.from_dataframe(df_pivoted)
+    values = df.value.values
+    data_vars = {}
+    for parameter, rows in sorted(df.groupby("parameter").indices.items()):
+        arr = np.full(shape, np.nan)
+        arr[tuple(i[rows] for i in idx)] = values[rows]
+        data_vars[parameter] = (dims, arr)
 
-    # rename observation_time to time so that time coordinate is the same
-    # across different data sources in dmidc
-    ds = ds.rename(observation_time="time")
+    ds = xr.Dataset(data_vars, coords=coords)
 
     for var_name in ds.data_vars:
-        units = parameter_metainfo.PARAMETER_UNITS.get(var_name)
-        if units is None:
-            raise Exception(f"Unknown units for parameter: {var_name}")
-        long_name = parameter_metainfo.PARAMETER_LONG_NAMES.get(var_name)
-        if long_name is None:
-            raise Exception(f"Unknown long name for parameter: {var_name}")
-
-        ds[var_name].attrs["units"] = units
-        ds[var_name].attrs["long_name"] = long_name
+        attrs = parameter_metainfo.PARAMETER_ATTRS.get(var_name)
+        if attrs is None:
+            raise Exception(f"Unknown units and long name for parameter: {var_name}")
+        ds[var_name].attrs.update(attrs)
 
     return ds
 
 
 def _dmidc_to_opendata_params(params):
     return {
-        DMIDC_OPENDATA_PARAM_MAP.get(key, key): value for key, value in params.items()
+        _DMIDC_TO_OPENDATA_PARAMS.get(key, key): value for key, value in params.items()
     }
 
 
 def _opendata_to_dmidc_params(params):
-    return {
-        DMIDC_OPENDATA_PARAM_MAP.inverse[key]: value for key, value in params.items()
-    }
+    return {_OPENDATA_TO_DMIDC_PARAMS[key]: value for key, value in params.items()}
 
 
 def _is_listlike(obj):
@@ -93,7 +114,7 @@ def load(
         Time range to load data for
     parameter : str or list of str or None
         Parameter(s) to load data for. Defaults to None, which loads all parameters
-        as defined in `dmidc.metobs.dmi_opendata.parameter_metainfo.PARAMS_DF`
+        as defined in `dmidc.metobs.dmi_opendata.parameter_metainfo.PARAMETER_NAMES`
     bbox : tuple of float
         Bounding box to load data for given as [W, S, E, N]
     as_dataframe : bool
@@ -106,6 +127,10 @@ def load(
     xarray.Dataset or pandas.DataFrame
         Dataset or DataFrame with data for the given time range and parameter(s)
     """
+    # geopandas and xarray are slow to import, so they are only imported once needed
+    import geopandas as gpd
+    import xarray as xr
+
     observation_time = normalise_time_argument(observation_time, allow_date=True)
     api = remote_api.get_api_handle()
 
@@ -114,10 +139,9 @@ def load(
         # that can be handled by the API by setting station_id to an empty string
         pass
     elif _is_listlike(station_id):
-        station_ids = station_id
-        del station_id
-        outputs = []
-        for station_id in station_ids:
+        # each station is loaded with an independent (HTTP-bound) request, so
+        # these are run concurrently
+        def _load_station(station_id):
             output = load(
                 observation_time=observation_time,
                 parameter=parameter,
@@ -128,7 +152,13 @@ def load(
             )
             if not as_dataframe:
                 output = output.expand_dims(station_id=[station_id])
-            outputs.append(output)
+            return output
+
+        station_ids = station_id
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(MAX_CONCURRENT_REQUESTS, len(station_ids)))
+        ) as executor:
+            outputs = list(executor.map(_load_station, station_ids))
 
         if as_dataframe:
             return pd.concat(outputs)
@@ -158,32 +188,48 @@ def load(
     elif isinstance(parameter, list):
         parameters = parameter
     elif parameter is None:
-        parameters = parameter_metainfo.PARAMS_DF.name.to_list()
+        parameters = list(parameter_metainfo.PARAMETER_NAMES)
     else:
         raise ValueError(f"Invalid parameter type: {type(parameter)}")
 
-    dfs = []
-    for parameter in parameters:
+    def _fetch(parameter):
         api_params = dict(parameter=parameter, **kwargs)
-        result = api.collection_items(
-            collection_id="observation", **_dmidc_to_opendata_params(api_params)
-        )
+        with _REQUEST_SEMAPHORE:
+            result = api.collection_items(
+                collection_id="observation", **_dmidc_to_opendata_params(api_params)
+            )
         df = gpd.GeoDataFrame.from_features(result)
         if len(df) == 0:
             logger.warning(
                 f"No data found for parameter {parameter} with query params: {kwargs}"
             )
-        dfs.append(df)
+        return df
 
-    df = gpd.GeoDataFrame(pd.concat(dfs, ignore_index=True))
+    # one request is made per parameter, these are I/O-bound and so are made
+    # concurrently from a pool of threads
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(MAX_CONCURRENT_REQUESTS, len(parameters)))
+    ) as executor:
+        dfs = list(executor.map(_fetch, parameters))
+
+    # only concatenate the parameters for which data was found
+    dfs = [df for df in dfs if len(df) > 0]
+    if len(dfs) > 0:
+        df = gpd.GeoDataFrame(pd.concat(dfs, ignore_index=True))
+    else:
+        df = gpd.GeoDataFrame()
 
     # convert Open Data API parameter names to DMIDC parameter names
-    df.columns = [DMIDC_OPENDATA_PARAM_MAP.inverse.get(col, col) for col in df.columns]
+    df.columns = [_OPENDATA_TO_DMIDC_PARAMS.get(col, col) for col in df.columns]
 
     if len(df) > 0:
         # timestamps are strings, convert to datetime
-        df["observation_time"] = df.observation_time.apply(isodate.parse_datetime)
-        df["creation_time"] = df.creation_time.apply(isodate.parse_datetime)
+        df["observation_time"] = pd.to_datetime(
+            df.observation_time, format="ISO8601", utc=True, cache=True
+        )
+        df["creation_time"] = pd.to_datetime(
+            df.creation_time, format="ISO8601", utc=True, cache=True
+        )
 
     if as_dataframe:
         return df
@@ -1,10 +1,74 @@
+import os
+import pickle
+import tempfile
 from pathlib import Path
-
-import pandas as pd
+from types import MappingProxyType
 
 FP_PARAMS_DF = Path(__file__).parent / "opendata_metobs_parameters.csv"
+# parsed parameter metainfo is cached next to the csv-file so that subsequent
+# imports don't need to parse the csv-file with pandas
+FP_PARAMS_CACHE = FP_PARAMS_DF.with_suffix(".pkl")
+
+
+def _load_parameter_metainfo():
+    """
+    Load the units and long names of all parameters, either from the pickle
+    cache (if it is newer than the csv-file) or by parsing the csv-file and
+    then writing the cache.
+    """
+    try:
+        if FP_PARAMS_CACHE.stat().st_mtime >= FP_PARAMS_DF.stat().st_mtime:
+            with open(FP_PARAMS_CACHE, "rb") as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        # cache is missing or unreadable, fall back to parsing the csv-file
+        pass
+
+    import pandas as pd
+
+    df_params = pd.read_csv(FP_PARAMS_DF)
+    metainfo = (
+        dict(zip(df_params["name"], df_params["unit"])),
+        dict(zip(df_params["name"], df_params["description"])),
+    )
+    # write to a temporary file that is then moved into place, so that other
+    # processes importing at the same time never read a partially written cache
+    fp_tmp = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=FP_PARAMS_CACHE.parent, suffix=".tmp", delete=False
+        ) as f:
+            fp_tmp = f.name
+            pickle.dump(metainfo, f)
+        os.replace(fp_tmp, FP_PARAMS_CACHE)
+    except OSError:
+        # e.g. package installed in a read-only location, we just parse the
+        # csv-file again next time
+        if fp_tmp is not None and os.path.exists(fp_tmp):
+            os.remove(fp_tmp)
+    return metainfo
+
+
+PARAMETER_UNITS, PARAMETER_LONG_NAMES = _load_parameter_metainfo()
+PARAMETER_NAMES = list(PARAMETER_UNITS)
+
+# attributes to set on each parameter variable in a dataset
+PARAMETER_ATTRS = MappingProxyType(
+    {
+        name: MappingProxyType(
+            dict(units=PARAMETER_UNITS[name], long_name=PARAMETER_LONG_NAMES[name])
+        )
+        for name in PARAMETER_NAMES
+    }
+)
+
 
-PARAMS_DF = pd.read_csv(FP_PARAMS_DF)
+def __getattr__(name):
+    # the full parameter table is only parsed from the csv-file when first
+    # accessed, and then kept as a module attribute
+    if name == "PARAMS_DF":
+        import pandas as pd
 
-PARAMETER_UNITS = dict(zip(PARAMS_DF["name"], PARAMS_DF["unit"]))
-PARAMETER_LONG_NAMES = dict(zip(PARAMS_DF["name"], PARAMS_DF["description"]))
+        globals()["PARAMS_DF"] = pd.read_csv(FP_PARAMS_DF)
+        return globals()["PARAMS_DF"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
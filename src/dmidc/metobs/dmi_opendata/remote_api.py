@@ -1,3 +1,4 @@
+import functools
 from owslib.ogcapi.features import Features
 import dotenv
 import os
@@ -6,6 +7,7 @@ URL_API = "https://dmigw.govcloud.dk/v2/metObs"
 API_KEY_ENV_VAR = "DMI_OPENDATA_API_KEY"
 
 
+@functools.lru_cache(maxsize=1)
 def fetch_api_key_from_dotenv():
     """
     Fetch the API key from the .env file.
@@ -19,7 +21,12 @@ def fetch_api_key_from_dotenv():
         raise ImportError("Please install python-dotenv to use this function.")
 
 
+@functools.lru_cache(maxsize=1)
 def get_api_handle():
+    """
+    Get a handle to the Open Data API. The handle is created (and the
+    conformance of the API checked) only once per process and then reused.
+    """
     api_key = fetch_api_key_from_dotenv()
     headers = {"X-Gravitee-Api-Key": api_key}
     api = Features(URL_API, headers=headers)
@@ -1,12 +1,12 @@
-import geopandas as gpd
 import inflection
-import isodate
-import xarray as xr
-from shapely.geometry import Point
+import numpy as np
+import pandas as pd
 
 from . import remote_api
 from .time_utils import construct_time_interval, normalise_time_argument
 
+STATION_LOOKUP_INFO = {}
+
 
 def get_stations(observation_time=None, bbox=None, as_dataframe=False, **kwargs):
     """
@@ -48,6 +48,9 @@ def get_stations(observation_time=None, bbox=None, as_dataframe=False, **kwargs)
         else:
             raise NotImplementedError("Only time ranges are supported")
 
+    # geopandas is slow to import, so it is only imported once needed
+    import geopandas as gpd
+
     api = remote_api.get_api_handle()
     result = api.collection_items(collection_id="station", **kwargs)
     df = gpd.GeoDataFrame.from_features(result)
@@ -80,12 +83,36 @@ def get_nearest_station(pt: dict, observation_time=None, as_dataframe=False):
     if not isinstance(pt, dict) or set(pt.keys()) != {"lon", "lat"}:
         raise ValueError("`pt` must be a dict with keys 'lon' and 'lat'")
 
-    pt = Point(pt["lon"], pt["lat"])
+    # scipy is slow to import, so it is only imported once needed
+    import scipy.spatial
+
+    if isinstance(observation_time, slice):
+        cache_key = (
+            observation_time.start,
+            observation_time.stop,
+            observation_time.step,
+        )
+    else:
+        cache_key = observation_time
 
-    # we keep the result as a geopandas.GeoDataFrame to be able to use the
-    # spatial index for finding the nearest station by lat/lon coordinate
-    df_stations = get_stations(observation_time=observation_time, as_dataframe=True)
-    locs = df_stations.geometry.sindex.nearest(pt)[1]
+    # the stations and a KDTree over their unique lon/lat locations are cached
+    # per observation time, so that repeated lookups don't need to fetch the
+    # stations and build a spatial index again
+    if cache_key in STATION_LOOKUP_INFO:
+        df_stations, tree, location_idx = STATION_LOOKUP_INFO[cache_key]
+    else:
+        df_stations = get_stations(observation_time=observation_time, as_dataframe=True)
+        points = np.column_stack([df_stations.geometry.x, df_stations.geometry.y])
+        locations, location_idx = np.unique(points, axis=0, return_inverse=True)
+        # (the shape of the inverse index differs between numpy versions)
+        location_idx = location_idx.ravel()
+        tree = scipy.spatial.cKDTree(locations)
+        STATION_LOOKUP_INFO[cache_key] = (df_stations, tree, location_idx)
+
+    # multiple station entries can be at the same location, so return all the
+    # stations at the nearest location
+    _, k = tree.query((pt["lon"], pt["lat"]))
+    locs = np.flatnonzero(location_idx == k)
 
     df_nearest_station = df_stations.iloc[locs]
     if as_dataframe:
@@ -95,6 +122,8 @@ def get_nearest_station(pt: dict, observation_time=None, as_dataframe=False):
 
 
 def convert_stations_df_to_dataset(df):
+    import xarray as xr
+
     variables_to_keep = dict(
         name="station_name",
         lat="lat",
@@ -104,10 +133,9 @@ def convert_stations_df_to_dataset(df):
     df = df.copy()
     df["lon"], df["lat"] = df.geometry.x, df.geometry.y
 
-    df["valid_from"] = df.valid_from.apply(
-        lambda v: v and isodate.parse_datetime or None
-    )
-    df["valid_to"] = df.valid_to.apply(lambda v: v and isodate.parse_datetime or None)
+    # missing values (e.g. `valid_to` for stations still in operation) become NaT
+    df["valid_from"] = pd.to_datetime(df.valid_from, format="ISO8601", utc=True)
+    df["valid_to"] = pd.to_datetime(df.valid_to, format="ISO8601", utc=True)
 
     df.set_index("station_id", inplace=True)
     # df = df_stations.pivot(index="station_id", values="geometry")
@@ -0,0 +1,60 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import Point
+
+from dmidc.metobs.dmi_opendata import stations
+
+# two entries (with different validity periods) for the same station location
+STATIONS = [
+    ("06180", 12.5264, 55.6139),
+    ("06180", 12.5264, 55.6139),
+    ("06030", 9.8492, 57.0963),
+    ("06041", 10.6211, 57.7362),
+]
+
+
+@pytest.fixture(autouse=True)
+def mock_get_stations(monkeypatch):
+    df_stations = gpd.GeoDataFrame(
+        dict(
+            station_id=[station_id for station_id, _, _ in STATIONS],
+            name=[f"station {i}" for i in range(len(STATIONS))],
+            station_height=np.arange(len(STATIONS), dtype=float),
+        ),
+        geometry=[Point(lon, lat) for _, lon, lat in STATIONS],
+    )
+
+    def get_stations(observation_time=None, as_dataframe=False, **kwargs):
+        return df_stations
+
+    monkeypatch.setattr(stations, "get_stations", get_stations)
+    monkeypatch.setattr(stations, "STATION_LOOKUP_INFO", {})
+
+
+def _nearest_station_id_bruteforce(pt):
+    dists = [np.hypot(lon - pt["lon"], lat - pt["lat"]) for _, lon, lat in STATIONS]
+    return STATIONS[int(np.argmin(dists))][0]
+
+
+def test_get_nearest_station_random_points():
+    """
+    Every (off-station) point should return all entries of the nearest station
+    """
+    rng = np.random.default_rng(42)
+    for lon, lat in zip(rng.uniform(8.0, 15.0, 200), rng.uniform(54.5, 58.0, 200)):
+        pt = dict(lon=float(lon), lat=float(lat))
+        df_nearest = stations.get_nearest_station(pt, as_dataframe=True)
+        station_id = _nearest_station_id_bruteforce(pt)
+        n_entries = sum(sid == station_id for sid, _, _ in STATIONS)
+        assert list(df_nearest.station_id) == [station_id] * n_entries
+
+
+def test_get_nearest_station_colocated():
+    """
+    Both entries of a station with two entries at the same location should be
+    returned
+    """
+    pt = dict(lon=12.2603, lat=57.2885)
+    df_nearest = stations.get_nearest_station(pt, as_dataframe=True)
+    assert list(df_nearest.index) == [0, 1]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from dmidc.harmonie import utils
+
+
+def _create_dataset(dims):
+    ny, nx = 4, 6
+    lon, lat = np.meshgrid(np.linspace(0.0, 10.0, nx), np.linspace(50.0, 60.0, ny))
+    ds = xr.Dataset(
+        dict(idx=(("y", "x"), np.arange(nx * ny).reshape(ny, nx))),
+        coords=dict(lon=(("y", "x"), lon), lat=(("y", "x"), lat)),
+        attrs=dict(suite_name=f"test_{'_'.join(dims)}"),
+    )
+    return ds.transpose(*dims)
+
+
+@pytest.fixture(autouse=True)
+def lookup_info_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "FP_LOOKUP_INFO_ROOT", tmp_path)
+    monkeypatch.setattr(utils, "LOOKUP_INFO", {})
+
+
+@pytest.mark.parametrize("dims", [("y", "x"), ("x", "y")])
+@pytest.mark.parametrize("from_disk_cache", [False, True])
+def test_sel_nearest_to_latlon_pt_roundtrip(dims, from_disk_cache):
+    """
+    Every grid point's own lat/lon should select that same grid point
+    """
+    ds = _create_dataset(dims)
+
+    if from_disk_cache:
+        # build the lookup tree and write it to disk, then forget the in-memory
+        # copy so that the lookups below use the tree loaded from disk
+        utils.sel_nearest_to_latlon_pt(ds, dict(lon=5.0, lat=55.0))
+        utils.LOOKUP_INFO.clear()
+
+    for i in range(ds.sizes["x"]):
+        for j in range(ds.sizes["y"]):
+            ds_pt = ds.isel(x=i, y=j)
+            pt = dict(lon=float(ds_pt.lon), lat=float(ds_pt.lat))
+            ds_nearest = utils.sel_nearest_to_latlon_pt(ds, pt)
+            assert int(ds_nearest.idx) == int(ds_pt.idx)
+            assert float(ds_nearest.lon) == pt["lon"]
+
+
+def test_sel_nearest_to_latlon_pt_corrupt_cache(tmp_path):
+    """
+    A partially written cache should be rebuilt rather than fail the lookup
+    """
+    ds = _create_dataset(("y", "x"))
+    identifier = ds.attrs["suite_name"]
+    utils.sel_nearest_to_latlon_pt(ds, dict(lon=5.0, lat=55.0))
+    utils.LOOKUP_INFO.clear()
+
+    fp_info = tmp_path / f"{identifier}.info.json"
+    fp_info.write_text(fp_info.read_text()[:10])
+
+    ds_pt = ds.isel(x=2, y=1)
+    pt = dict(lon=float(ds_pt.lon), lat=float(ds_pt.lat))
+    ds_nearest = utils.sel_nearest_to_latlon_pt(ds, pt)
+    assert int(ds_nearest.idx) == int(ds_pt.idx)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"{identifier}.info.json",
+        f"{identifier}.points.npy",
+    ]